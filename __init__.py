@@ -11,7 +11,15 @@ This package provides:
   • Local and distributed event handling
 """
 
-from .client_v2 import AEClient
-
 __all__ = ["AEClient"]
 __version__ = "0.9.2-phase-4b"
+
+
+def __getattr__(name):
+    # PEP 562: resolve AEClient (and its aegnix_core imports) on first access,
+    # so importing a submodule such as aegnix_ae.session stays cheap.
+    if name == "AEClient":
+        from .client_v2 import AEClient
+
+        return AEClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,232 @@
 # aegnix_ae/client_v2.py
+import asyncio
+import inspect
+import json
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional
-
-import requests
-from aegnix_core.crypto import (compute_pubkey_fingerprint, ed25519_sign,
-                                sign_envelope, derive_ed25519_pub)
-from aegnix_core.envelope import Envelope
-from aegnix_core.transport import transport_factory
-from aegnix_core.utils import b64d, b64e
+import threading
+import time
+from binascii import a2b_base64, b2a_base64
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from aegnix_core.crypto import (
+    compute_pubkey_fingerprint,
+    derive_ed25519_pub,
+    sign_envelope,
+)
 
 from aegnix_ae.decorators import EventRegistry
 from aegnix_ae.session import SessionState, SessionStore
+from aegnix_ae.signing import Ed25519Signer
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # optional: falls back to stdlib json / dict publish
+    orjson = None
+    _json_loads = json.loads
+
+if TYPE_CHECKING:
+    from aegnix_core.envelope import Envelope
 
 log = logging.getLogger(__name__)
 
+# Labels used when emit() is called without any. Envelopes get their own
+# list(_DEFAULT_LABELS) copy: Envelope.make expects a list, and subscriber
+# handlers receive it and may mutate it.
+_DEFAULT_LABELS = ("default",)
+
+# Background refresh: renew this long before access-token expiry, never
+# sooner than _REFRESH_MIN_S apart (guards against tokens issued with a
+# missing/zero expires_in), and back off exponentially from
+# _REFRESH_RETRY_S up to _REFRESH_RETRY_MAX_S after failed attempts
+_REFRESH_LEAD_S = 30
+_REFRESH_MIN_S = 15
+_REFRESH_RETRY_S = 5
+_REFRESH_RETRY_MAX_S = 300
+
+# Bound on the /session/refresh POST, which runs under the refresh lock
+_REFRESH_TIMEOUT_S = 5.0
+
+# ----------------------------------------------------------------------
+# Lazy imports
+#
+# requests (+ urllib3/charset_normalizer) and the aegnix_core envelope /
+# transport modules are only loaded on first use, so an AE that never
+# touches a given path never pays its import cost. aegnix_core.crypto is
+# needed by __init__ anyway and is imported eagerly above.
+# ----------------------------------------------------------------------
+_requests = None
+_Envelope = None
+_transport_factory = None
+
+
+def _get_requests():
+    global _requests
+    if _requests is None:
+        import requests as _requests
+    return _requests
+
+
+def _get_envelope():
+    global _Envelope
+    if _Envelope is None:
+        from aegnix_core.envelope import Envelope as _Envelope
+    return _Envelope
+
+
+def _get_transport_factory():
+    global _transport_factory
+    if _transport_factory is None:
+        from aegnix_core.transport import transport_factory as _transport_factory
+    return _transport_factory
+
+
+def _build_transport(kind: Optional[str], abi_url: str) -> Any:
+    """
+    Build a transport via aegnix_core's transport_factory().
+
+    Factories that accept ``kind`` / ``abi_url`` get them explicitly. Older
+    ones that take no arguments are configured through $AE_TRANSPORT, as
+    before; AEClient sets ``base_url`` on the result either way.
+    """
+    factory = _get_transport_factory()
+    if _accepts_transport_config(factory):
+        return factory(kind=kind, abi_url=abi_url)
+    if kind is not None:
+        os.environ["AE_TRANSPORT"] = kind
+    return factory()
+
+
+def _accepts_transport_config(factory: Callable) -> bool:
+    try:
+        params = inspect.signature(factory).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    names = {p.name for p in params}
+    return {"kind", "abi_url"} <= names or any(p.kind is p.VAR_KEYWORD for p in params)
+
+
+# ----------------------------------------------------------------------
+# Shared transports
+# ----------------------------------------------------------------------
+# (kind, abi_url) -> [transport, number of AEClients using it]
+_transport_cache: Dict[tuple, list] = {}
+_transport_cache_lock = threading.Lock()
+
+
+def _acquire_shared_transport(
+    kind: Optional[str], abi_url: str
+) -> Tuple[Any, Optional[tuple]]:
+    """
+    Resolve a transport via _build_transport(), shared by (kind, abi_url).
+
+    Used only for AEClient(share_transport=True): those AEClients share one
+    transport (and its connection pool / in-process bus). Transports that
+    carry per-AE credentials (``set_grant`` / ``set_token``) are never
+    shared, since each AE pushes its own access token into them.
+
+    Returns ``(transport, key)``; ``key`` is None for an unshared transport
+    and must otherwise be handed back to _release_shared_transport().
+    """
+    key = (kind or os.getenv("AE_TRANSPORT"), abi_url)
+    with _transport_cache_lock:
+        entry = _transport_cache.get(key)
+        if entry is None:
+            transport = _build_transport(kind, abi_url)
+            if hasattr(transport, "set_grant") or hasattr(transport, "set_token"):
+                log.debug(
+                    "Not sharing %s transport for %s: it carries a per-AE token",
+                    key[0],
+                    abi_url,
+                )
+                return transport, None
+            entry = _transport_cache[key] = [transport, 0]
+        entry[1] += 1
+        return entry[0], key
+
+
+def _release_shared_transport(key: tuple) -> bool:
+    """Drop one user of a shared transport; True if it was the last one."""
+    with _transport_cache_lock:
+        entry = _transport_cache.get(key)
+        if entry is None:
+            return True
+        entry[1] -= 1
+        if entry[1] > 0:
+            return False
+        del _transport_cache[key]
+        return True
+
+
+# ----------------------------------------------------------------------
+# Shared ABI connection pool
+# ----------------------------------------------------------------------
+_http_adapter = None
+_http_adapter_lock = threading.Lock()
+
+
+def _get_http_adapter() -> Any:
+    """
+    Process-wide requests HTTPAdapter (urllib3 pool, per-host) mounted by
+    every AEClient's Session, so AEs talking to the same ABI share sockets
+    while keeping their own Authorization headers on their Session.
+    """
+    global _http_adapter
+    if _http_adapter is None:
+        with _http_adapter_lock:
+            if _http_adapter is None:
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Connection failures only: every ABI call is a POST and
+                # /verify (nonce) and /session/refresh (token rotation) must
+                # not be replayed, so no status-based retries
+                _http_adapter = HTTPAdapter(
+                    pool_connections=10,
+                    pool_maxsize=100,
+                    max_retries=Retry(total=3, backoff_factor=0.2),
+                )
+    return _http_adapter
+
+
+def _build_http_session() -> Any:
+    """
+    Keep-alive HTTP client shared by every ABI call of one AEClient, so the
+    register → verify → capabilities → refresh sequence reuses a connection.
+
+    Backend is chosen by ``AE_HTTP_BACKEND``:
+      - "requests" (default): ``requests.Session`` on the process-wide pool
+      - "httpx": ``httpx.Client(http2=True)`` — one multiplexed connection
+        with HPACK-compressed headers (requires ``httpx[http2]``)
+    """
+    if os.getenv("AE_HTTP_BACKEND", "requests").lower() == "httpx":
+        import httpx
+
+        return httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(5.0, connect=2.0),
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+
+    http = _get_requests().Session()
+    adapter = _get_http_adapter()
+    http.mount("http://", adapter)
+    http.mount("https://", adapter)
+    return http
+
+
+def _mounts_shared_pool(http: Any) -> bool:
+    adapters = getattr(http, "adapters", None)
+    return (
+        _http_adapter is not None
+        and adapters is not None
+        and (adapters.get("https://") is _http_adapter)
+    )
+
 
 class AEClientError(Exception):
     """Base AEClient error."""
@@ -31,7 +243,10 @@ class RegistrationError(AEClientError):
 class SessionError(AEClientError):
     """Raised when session/refresh operations fail."""
 
-    pass
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        # HTTP status of the ABI response, when the failure came from one
+        self.status_code = status_code
 
 
 class AEClient:
@@ -62,7 +277,17 @@ class AEClient:
             "pub": str|bytes (public key, base64 or raw)
             "priv": str|bytes (private key, base64 or raw)
     transport : str or Transport, optional
-        If str, sets AE_TRANSPORT and resolves via transport_factory().
+        If str (or None), resolved via transport_factory(kind=..., abi_url=...);
+        None lets the factory fall back to $AE_TRANSPORT. A factory without
+        those parameters is called as transport_factory(), with a str
+        transport exported as $AE_TRANSPORT first.
+    share_transport : bool
+        If True (and transport is a str or None), reuse one transport per
+        (kind, abi_url) across all AEClients that also opt in. Opting in to
+        a local bus means those AEs see each other's messages. Transports
+        with a per-AE token (set_grant / set_token, e.g. HTTP) are never
+        shared; the option is then a no-op (logged at debug level).
+        Default False: a private transport.
     publishes : list[str], optional
         Subjects AE will emit.
     subscribes : list[str], optional
@@ -70,15 +295,65 @@ class AEClient:
     session_store_path : str, optional
         JSON file to persist session. Defaults to ~/.aegnix/sessions/<name>.json
     auto_refresh : bool
-        If True, AEClient will refresh access token lazily on emit() when expiring.
+        If True, a background thread refreshes the access token ahead of
+        expiry, with a lazy refresh on emit() as fallback.
     auto_persist : bool
         If True, session is saved to disk after register/refresh.
+    session_fsync : bool
+        If True, every session save is fsync'd (file and directory) before
+        returning. Default False; see SessionStore.
 
     Advanced usage:
       - Set auto_refresh=False and call refresh_session() yourself.
       - Inject a custom Transport that knows how to use access_token.
     """
 
+    __slots__ = (
+        # public
+        "name",
+        "abi_url",
+        "keypair",
+        "registry",
+        "publishes",
+        "subscribes",
+        "auto_refresh",
+        "auto_persist",
+        "session_store",
+        "session",
+        "transport",
+        # HTTP / ABI endpoints
+        "_http",
+        "_register_url",
+        "_verify_url",
+        "_refresh_url",
+        "_cap_url",
+        "_auth_headers",
+        # key material / envelope invariants
+        "_priv_raw",
+        "_pub_raw",
+        "_signer",
+        "_key_id",
+        "_make_envelope",
+        "_sign_envelope",
+        # resolved transport capabilities
+        "_transport_key",
+        "_transport_set_token",
+        "_needs_token",
+        "_publish",
+        "_subscribe",
+        "_publish_batch",
+        "_publish_bytes",
+        "_handlers",
+        # async support / background refresh
+        "_executor",
+        "_pending",
+        "_pool_lock",
+        "_refresh_thread",
+        "_refresh_stop",
+        "_refresh_lock",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         name: str,
@@ -90,11 +365,12 @@ class AEClient:
         session_store_path: Optional[str] = None,
         auto_refresh: bool = True,
         auto_persist: bool = True,
+        share_transport: bool = False,
+        session_fsync: bool = False,
     ):
         self.name = name
-        self.abi_url = abi_url or os.getenv("ABI_URL", "http://localhost:8080").rstrip(
-            "/"
-        )
+        abi_url = abi_url or os.getenv("ABI_URL", "http://localhost:8080")
+        self.abi_url = abi_url.rstrip("/")
         self.keypair = keypair or {}
         self.registry = EventRegistry()
 
@@ -104,30 +380,77 @@ class AEClient:
         self.auto_refresh = auto_refresh
         self.auto_persist = auto_persist
 
+        # Pooled HTTP session + precomputed ABI endpoints
+        self._http = None  # built on first ABI call
+        self._executor: Optional[ThreadPoolExecutor] = None  # built on first use
+        self._pending: Set[Future] = set()  # in-flight emit_nowait() calls
+        # Guards _executor creation/shutdown, submission and _pending
+        self._pool_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        self._refresh_lock = threading.RLock()
+        self._handlers: tuple = ()  # frozen by listen()
+        self._register_url = f"{self.abi_url}/register"
+        self._verify_url = f"{self.abi_url}/verify"
+        self._refresh_url = f"{self.abi_url}/session/refresh"
+        self._cap_url = f"{self.abi_url}/ae/capabilities"
+
         # Session
         if session_store_path is None:
             # ~/.aegnix/sessions/<name>.json
             default_dir = os.path.join(os.path.expanduser("~"), ".aegnix", "sessions")
             os.makedirs(default_dir, exist_ok=True)
             session_store_path = os.path.join(default_dir, f"{name}.json")
-        self.session_store = SessionStore(session_store_path)
+        self.session_store = SessionStore(session_store_path, fsync=session_fsync)
         self.session: Optional[SessionState] = None
+        self._auth_headers: Optional[Dict[str, str]] = None
 
         # --- Keypair validation & normalization
         self._validate_and_normalize_keypair()
+        self._key_id = compute_pubkey_fingerprint(self.keypair["pub_b64"])
+
+        # Envelope.make with this AE's producer/key_id bound (first emit)
+        self._make_envelope: Optional[Callable[..., "Envelope"]] = None
+        # sign_envelope with this AE's private key and key_id bound; called
+        # positionally, matching sign_envelope(env, priv, key_id)
+        priv, key_id = self._priv_raw, self._key_id
+        self._sign_envelope = lambda env: sign_envelope(env, priv, key_id)
 
         # --- Transport selection
-        if isinstance(transport, str):
-            os.environ["AE_TRANSPORT"] = transport
-            os.environ["ABI_URL"] = self.abi_url
-            self.transport = transport_factory()
+        # Config is passed explicitly (no os.environ side channel), so
+        # several AEClients can be built concurrently in one process; only
+        # a legacy no-argument transport_factory() still reads $AE_TRANSPORT.
+        self._transport_key: Optional[tuple] = None
+        if transport is None or isinstance(transport, str):
+            if share_transport:
+                self.transport, self._transport_key = _acquire_shared_transport(
+                    transport, self.abi_url
+                )
+            else:
+                self.transport = _build_transport(transport, self.abi_url)
         else:
-            self.transport = transport or transport_factory()
+            self.transport = transport
 
         # Some transports (e.g. HTTP) may need base URL
         if hasattr(self.transport, "base_url"):
             self.transport.base_url = self.abi_url
 
+        # Resolve transport capabilities once; hot paths call these directly
+        self._transport_set_token = getattr(
+            self.transport, "set_grant", None
+        ) or getattr(self.transport, "set_token", None)
+        # Transports without a token setter (e.g. the local bus) never see the
+        # access token, so emit()/listen() skip the expiry check for them
+        self._needs_token = self._transport_set_token is not None
+        self._publish = self.transport.publish
+        self._subscribe = self.transport.subscribe
+        self._publish_batch = getattr(self.transport, "publish_batch", None) or getattr(
+            self.transport, "publish_many", None
+        )
+        self._publish_bytes = None
+        if orjson is not None:
+            self._publish_bytes = getattr(self.transport, "publish_bytes", None)
+
     # ------------------------------------------------------------------
     # Keypair normalization
     # ------------------------------------------------------------------
@@ -139,7 +462,7 @@ class AEClient:
         priv = self.keypair["priv"]
         if isinstance(priv, str):
             try:
-                priv = b64d(priv)
+                priv = a2b_base64(priv)
             except Exception:
                 priv = priv.encode("utf-8")
         self.keypair["priv"] = priv
@@ -147,46 +470,30 @@ class AEClient:
         # Try to get or derive pubkey
         pub_b64 = self.keypair.get("pub")
         if pub_b64 is None:
-            # derive from priv (you may already have a helper for this;
-            # if not, we add one in aegnix_core.crypto)
-             # <- add this helper
             pub_raw = derive_ed25519_pub(priv)
-            pub_b64 = b64e(pub_raw)
+            pub_b64 = b2a_base64(pub_raw, newline=False).decode("ascii")
         elif isinstance(pub_b64, bytes):
-            pub_b64 = b64e(pub_b64)
+            pub_b64 = b2a_base64(pub_b64, newline=False).decode("ascii")
 
         self.keypair["pub_b64"] = pub_b64
 
-    # def _validate_and_normalize_keypair(self) -> None:
-    #     if "pub" not in self.keypair or "priv" not in self.keypair:
-    #         raise ValueError("AEClient requires keypair containing 'pub' and 'priv'")
-    #
-    #     # Normalize priv key to raw bytes
-    #     priv = self.keypair["priv"]
-    #     if isinstance(priv, str):
-    #         try:
-    #             # assume base64
-    #             priv = b64d(priv)
-    #         except Exception:
-    #             # if not base64, treat as raw utf-8
-    #             priv = priv.encode("utf-8")
-    #     self.keypair["priv"] = priv
-    #
-    #     # Normalize pub key to base64 string (for key_id, metadata)
-    #     pub = self.keypair["pub"]
-    #     if isinstance(pub, bytes):
-    #         pub_b64 = b64e(pub)
-    #     else:
-    #         # assume pub already base64 string
-    #         pub_b64 = pub
-    #     self.keypair["pub_b64"] = pub_b64
+        # Raw key material, decoded once and reused by every sign call.
+        # Shape is checked here so emit() never has to.
+        self._priv_raw = priv
+        self._pub_raw = a2b_base64(pub_b64)
+        if len(self._priv_raw) != 32:
+            raise ValueError("AEClient requires a 32-byte Ed25519 private key seed")
+        if len(self._pub_raw) != 32:
+            raise ValueError("AEClient requires a 32-byte Ed25519 public key")
+        self._signer = Ed25519Signer(priv)
 
     # ------------------------------------------------------------------
     # Session helpers
     # ------------------------------------------------------------------
     def _apply_session_to_transport(self) -> None:
         """
-        Push current access_token into transport, if supported.
+        Push current access_token into transport, if supported, and onto
+        the pooled ABI client's default headers.
 
         We keep the old "set_grant" convention so existing transports
         keep working, but they are now given the access_token.
@@ -194,16 +501,24 @@ class AEClient:
         if not self.session:
             return
 
-        if hasattr(self.transport, "set_grant"):
-            self.transport.set_grant(self.session.access_token)
-        elif hasattr(self.transport, "set_token"):
-            self.transport.set_token(self.session.access_token)
-        # else: transport may not require JWT (e.g. local bus)
+        # Bind the bearer token onto the pooled client once, so ABI calls
+        # don't rebuild / re-merge headers per request
+        self._auth_headers = {"Authorization": f"Bearer {self.session.access_token}"}
+        if self._http is not None:
+            self._http.headers.update(self._auth_headers)
+
+        # None when the transport does not take a JWT (e.g. local bus)
+        if self._transport_set_token is not None:
+            self._transport_set_token(self.session.access_token)
 
     def _save_session_if_needed(self) -> None:
         if self.auto_persist and self.session:
             self.session_store.save(self.session)
 
+    def _save_tokens_if_needed(self) -> None:
+        if self.auto_persist and self.session:
+            self.session_store.save_tokens(self.session)
+
     # ------------------------------------------------------------------
     # Public API: registration & lifecycle
     # ------------------------------------------------------------------
@@ -215,48 +530,117 @@ class AEClient:
         or an expired/invalid session.
         """
         ae_id = self.name
-        log.info(f"[{ae_id}] Starting ABI registration against {self.abi_url}")
+        log.info("[%s] Starting ABI registration against %s", ae_id, self.abi_url)
+        http = self._http_session()
 
         # 1) Request challenge
-        r = requests.post(f"{self.abi_url}/register", json={"ae_id": ae_id})
-        if not r.ok:
+        r = http.post(self._register_url, json={"ae_id": ae_id})
+        nonce = self._read_challenge(r)
+
+        # 2) Sign challenge (Ed25519)
+        sig = self._signer.sign(nonce)
+
+        # 3) Verify with ABI, 4) build session state from response
+        vr = http.post(self._verify_url, json=self._verify_body(sig))
+        self._complete_registration(vr)
+
+        # 5) Declare capabilities, if configured
+        if self.publishes or self.subscribes:
+            try:
+                self.declare_capabilities(self.publishes, self.subscribes)
+            except Exception as e:
+                log.error("[%s] Capability declaration failed: %s", ae_id, e)
+        return True
+
+    async def register_with_abi_async(self) -> bool:
+        """
+        Async variant of register_with_abi() using ``httpx.AsyncClient``.
+
+        Use AEClient.async_register() to bring up several AEs concurrently
+        over one shared client.
+        """
+        import httpx
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(5.0, connect=2.0)) as http:
+            return await self._async_register_single(http)
+
+    @classmethod
+    async def async_register(cls, clients: List["AEClient"]) -> List[bool]:
+        """
+        Register many AEs concurrently over one ``httpx.AsyncClient``.
+
+        Fleet cold start then costs roughly one handshake round-trip
+        instead of N serial ones. Every registration runs to completion
+        before the shared client is closed; if any failed, the first
+        failure (in ``clients`` order) is raised afterwards, and the AEs
+        that did register keep their sessions.
+        """
+        import httpx
+
+        async with httpx.AsyncClient(timeout=httpx.Timeout(5.0, connect=2.0)) as http:
+            results = await asyncio.gather(
+                *(c._async_register_single(http) for c in clients),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
+
+    async def _async_register_single(self, http: Any) -> bool:
+        ae_id = self.name
+        log.info("[%s] Starting async ABI registration against %s", ae_id, self.abi_url)
+
+        r = await http.post(self._register_url, json={"ae_id": ae_id})
+        nonce = self._read_challenge(r)
+
+        # Ed25519 signing is CPU-bound; keep the event loop responsive
+        sig = await asyncio.to_thread(self._signer.sign, nonce)
+
+        vr = await http.post(self._verify_url, json=self._verify_body(sig))
+        self._complete_registration(vr)
+
+        if self.publishes or self.subscribes:
+            payload = self._capabilities_payload(self.publishes, self.subscribes)
+            try:
+                cr = await http.post(
+                    self._cap_url, json=payload, headers=self._auth_headers
+                )
+                self._read_capabilities_response(cr, payload)
+            except Exception as e:
+                log.error("[%s] Capability declaration failed: %s", ae_id, e)
+        return True
+
+    # ------------------------------------------------------------------
+    # Registration steps shared by the sync and async paths
+    # ------------------------------------------------------------------
+    def _read_challenge(self, r: Any) -> bytes:
+        if r.status_code >= 400:
             raise RegistrationError(
                 f"Challenge request failed: {r.status_code} {r.text}"
             )
-        payload = r.json()
-        nonce_b64 = payload["nonce"]
-        nonce = b64d(nonce_b64)
+        return a2b_base64(_json_loads(r.content)["nonce"])
 
-        # 2) Sign challenge (Ed25519)
-        sig = ed25519_sign(self.keypair["priv"], nonce)
-        sig_b64 = b64e(sig)
+    def _verify_body(self, sig: bytes) -> Dict[str, str]:
+        return {
+            "ae_id": self.name,
+            "signed_nonce_b64": b2a_base64(sig, newline=False).decode("ascii"),
+        }
 
-        # 3) Verify with ABI
-        vr = requests.post(
-            f"{self.abi_url}/verify",
-            json={"ae_id": ae_id, "signed_nonce_b64": sig_b64},
-        )
-        if not vr.ok:
+    def _complete_registration(self, vr: Any) -> None:
+        if vr.status_code >= 400:
             raise RegistrationError(f"Verification failed: {vr.status_code} {vr.text}")
 
-        data = vr.json()
+        data = _json_loads(vr.content)
         if not data.get("verified"):
             raise RegistrationError(f"AE not verified: {data}")
 
-        log.info({"event": "ae_verified", "ae_id": ae_id})
+        log.info({"event": "ae_verified", "ae_id": self.name})
 
-        # 4) Build session state from response
-        self.session = SessionState.from_verify_response(ae_id=ae_id, data=data)
+        self.session = SessionState.from_verify_response(ae_id=self.name, data=data)
         self._apply_session_to_transport()
         self._save_session_if_needed()
-
-        # 5) Declare capabilities, if configured
-        if self.publishes or self.subscribes:
-            try:
-                self.declare_capabilities(self.publishes, self.subscribes)
-            except Exception as e:
-                log.error(f"[{ae_id}] Capability declaration failed: {e}")
-        return True
+        self._start_refresh_thread()
 
     def resume_or_register(self) -> bool:
         """
@@ -273,71 +657,121 @@ class AEClient:
         sess = self.session_store.load()
         if not sess:
             log.info(
-                f"[{ae_id}] No existing session on disk; performing fresh registration"
+                "[%s] No existing session on disk; performing fresh registration",
+                ae_id,
             )
             return self.register_with_abi()
 
         self.session = sess
-        log.info(
-            {
-                "event": "session_resume",
-                "ae_id": ae_id,
-                "session_id": sess.session_id,
-                "access_expired": sess.is_access_expired(),
-                "refresh_expired": sess.is_refresh_expired(),
-            }
-        )
+        now = int(time.time())
+        access_expired, refresh_expired = sess.check_expired(now)
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                {
+                    "event": "session_resume",
+                    "ae_id": ae_id,
+                    "session_id": sess.session_id,
+                    "access_expired": access_expired,
+                    "refresh_expired": refresh_expired,
+                }
+            )
 
-        if sess.is_refresh_expired(leeway=5):
-            log.info(f"[{ae_id}] Refresh token expired; performing fresh registration")
+        if sess.is_refresh_expired(leeway=5, now=now):
+            log.info("[%s] Refresh token expired; performing fresh registration", ae_id)
             return self.register_with_abi()
 
         # Try refresh to ensure we have a live access token
         try:
             self.refresh_session()
+            self._start_refresh_thread()
             return True
         except Exception as e:
             log.warning(
-                f"[{ae_id}] Failed to refresh existing session; re-registering: {e}"
+                "[%s] Failed to refresh existing session; re-registering: %s",
+                ae_id,
+                e,
             )
             return self.register_with_abi()
 
+    def _http_session(self) -> Any:
+        """Return the pooled ABI HTTP client, building it on first use."""
+        if self._http is None:
+            self._http = _build_http_session()
+            if self._auth_headers:
+                self._http.headers.update(self._auth_headers)
+        return self._http
+
+    def close(self) -> None:
+        """
+        Shut the client down: stop the background refresher, drain pending
+        aemit() / emit_nowait() calls, flush any envelopes a batching
+        transport is still holding, then release pooled ABI connections.
+        """
+        self._stop_refresh_thread()
+        # Fold refreshed tokens from the sidecar into the session file. No
+        # sidecar means nothing to fold (and a cleared session stays cleared)
+        if self.session_store.tokens_path.exists():
+            self._save_session_if_needed()
+        with self._pool_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        # A shared transport is flushed only by the last AEClient using it
+        key, self._transport_key = self._transport_key, None
+        flush = getattr(self.transport, "flush", None)
+        if flush is not None and (key is None or _release_shared_transport(key)):
+            flush()
+        http, self._http = self._http, None
+        # A requests Session only owns its mounted adapters; when those are
+        # the shared pool other AEClients still use, the Session is dropped
+        # rather than closed
+        if http is not None and not _mounts_shared_pool(http):
+            http.close()
+
     def refresh_session(self) -> None:
         """
         Explicit session refresh using /session/refresh.
 
         This is the manual control path used in advanced flows or when
-        auto_refresh=False.
+        auto_refresh=False. Serialized with the background refresher, since
+        ABI rotates the refresh token on every call.
         """
-        if not self.session:
-            raise SessionError("No active session to refresh")
+        with self._refresh_lock:
+            if not self.session:
+                raise SessionError("No active session to refresh")
 
-        if self.session.is_refresh_expired(leeway=0):
-            raise SessionError("Refresh token expired; AE must re-register")
+            if self.session.is_refresh_expired(leeway=0):
+                raise SessionError("Refresh token expired; AE must re-register")
 
-        body = {
-            "session_id": self.session.session_id,
-            "refresh_token": self.session.refresh_token,
-        }
-        r = requests.post(f"{self.abi_url}/session/refresh", json=body)
-        if not r.ok:
-            raise SessionError(f"Session refresh failed: {r.status_code} {r.text}")
-
-        data = r.json()
-        self.session = SessionState.from_refresh_response(
-            ae_id=self.name,
-            session_id=self.session.session_id,
-            data=data,
-        )
-        log.info(
-            {
-                "event": "session_refreshed",
-                "ae_id": self.name,
+            body = {
                 "session_id": self.session.session_id,
+                "refresh_token": self.session.refresh_token,
             }
-        )
-        self._apply_session_to_transport()
-        self._save_session_if_needed()
+            r = self._http_session().post(
+                self._refresh_url, json=body, timeout=_REFRESH_TIMEOUT_S
+            )
+            if r.status_code >= 400:
+                raise SessionError(
+                    f"Session refresh failed: {r.status_code} {r.text}",
+                    status_code=r.status_code,
+                )
+
+            data = _json_loads(r.content)
+            self.session = SessionState.from_refresh_response(
+                ae_id=self.name,
+                session_id=self.session.session_id,
+                data=data,
+            )
+            if log.isEnabledFor(logging.INFO):
+                log.info(
+                    {
+                        "event": "session_refreshed",
+                        "ae_id": self.name,
+                        "session_id": self.session.session_id,
+                    }
+                )
+            self._apply_session_to_transport()
+            self._save_tokens_if_needed()
 
     def _ensure_access_token(self, leeway: int = 5) -> None:
         """
@@ -349,6 +783,12 @@ class AEClient:
         if not self.session:
             raise SessionError("AE has no active session; call register_with_abi()")
 
+        # With the background refresher alive the token is renewed ahead of
+        # expiry, so only an actually-expired token needs handling here.
+        # Read once: close() may reset it concurrently.
+        thread = self._refresh_thread
+        if thread is not None and thread.is_alive():
+            leeway = 0
         if not self.session.is_access_expired(leeway=leeway):
             return
 
@@ -356,8 +796,82 @@ class AEClient:
             # manual-mode: caller must call refresh_session()
             raise SessionError("Access token expired; auto_refresh=False")
 
-        log.info(f"[{self.name}] Access token expiring/expired; refreshing")
-        self.refresh_session()
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            if not self.session.is_access_expired(leeway=leeway):
+                return
+            log.info("[%s] Access token expiring/expired; refreshing", self.name)
+            self.refresh_session()
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+    def _start_refresh_thread(self) -> None:
+        """Start the proactive refresher once a session exists (auto_refresh)."""
+        if not self.auto_refresh:
+            return
+        thread = self._refresh_thread
+        if thread is not None and thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name=f"ae-refresh-{self.name}", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        """
+        Refresh the access token ahead of expiry so emit() never pays the
+        /session/refresh round-trip.
+
+        Wakes up _REFRESH_LEAD_S before expiry (or halfway through very short
+        token lifetimes), but never sooner than _REFRESH_MIN_S. Transient
+        failures are retried with exponential backoff; the loop exits when
+        ABI rejects the refresh (4xx, e.g. a revoked token) or the refresh
+        token itself has expired, leaving emit() to surface it.
+        """
+        retry = _REFRESH_RETRY_S
+        delay: Optional[float] = None  # set after a failure: retry backoff
+        while not self._refresh_stop.is_set():
+            if delay is None:
+                session = self.session
+                if session is None:
+                    return
+                remaining = session.access_deadline_mono - time.monotonic()
+                delay = max(
+                    remaining - min(_REFRESH_LEAD_S, remaining / 2), _REFRESH_MIN_S
+                )
+            if self._refresh_stop.wait(delay):
+                return
+            delay = None
+            try:
+                self.refresh_session()
+            except Exception as e:
+                status = e.status_code if isinstance(e, SessionError) else None
+                if (
+                    (status is not None and 400 <= status < 500)
+                    or self.session is None
+                    or self.session.is_refresh_expired()
+                ):
+                    log.warning("[%s] Background refresh stopped: %s", self.name, e)
+                    return
+                log.warning(
+                    "[%s] Background refresh failed; retrying in %ss: %s",
+                    self.name,
+                    retry,
+                    e,
+                )
+                delay = retry
+                retry = min(retry * 2, _REFRESH_RETRY_MAX_S)
+            else:
+                retry = _REFRESH_RETRY_S
+
+    def _stop_refresh_thread(self) -> None:
+        self._refresh_stop.set()
+        thread = self._refresh_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self._refresh_thread = None
 
     # ------------------------------------------------------------------
     # Emit
@@ -369,34 +883,161 @@ class AEClient:
         Emit a signed envelope via the configured transport.
 
         Behavior:
-          - Ensures a valid access token (refreshing if needed, if auto_refresh=True)
+          - Ensures a valid access token when the transport uses one
+            (refreshing if needed, if auto_refresh=True)
           - Signs the envelope with AE's Ed25519 keypair
           - Delegates actual publish to the Transport
         """
-        # Ensure session/access token is good (if your transport needs it)
-        self._ensure_access_token()
-
-        key_id = compute_pubkey_fingerprint(self.keypair["pub_b64"])
+        # Ensure session/access token is good (only if the transport uses it)
+        if self._needs_token:
+            self._ensure_access_token()
 
-        env = Envelope.make(
-            producer=self.name,
-            subject=subject,
-            payload=payload,
-            labels=labels or ["default"],
-            # key_id=self.keypair["pub_b64"],
-            key_id=key_id,
-        )
-        env = sign_envelope(env, self.keypair["priv"], env.key_id)
-        self.transport.publish(subject, env.to_dict())
-
-        log.debug(
-            {
-                "event": "emit",
-                "ae_id": self.name,
-                "subject": subject,
-                "labels": labels or ["default"],
-            }
+        env = self._envelope_maker()(
+            subject=subject, payload=payload, labels=labels or list(_DEFAULT_LABELS)
         )
+        env = self._sign_envelope(env)
+        self._emit_bytes(subject, env)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                {
+                    "event": "emit",
+                    "ae_id": self.name,
+                    "subject": subject,
+                    "labels": labels or _DEFAULT_LABELS,
+                }
+            )
+
+    def _envelope_maker(self) -> Callable[..., "Envelope"]:
+        """Envelope.make specialized for this AE's invariant producer/key_id."""
+        make = self._make_envelope
+        if make is None:
+            make = self._make_envelope = partial(
+                _get_envelope().make, producer=self.name, key_id=self._key_id
+            )
+        return make
+
+    def emit_many(
+        self,
+        subject: str,
+        payloads: List[Dict[str, Any]],
+        labels: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Emit a burst of signed envelopes on one subject.
+
+        Behavior:
+          - Checks the access token once for the whole batch
+          - Builds and signs every envelope in a single tight loop
+          - Uses ``transport.publish_batch(subject, envelopes)`` (or
+            ``publish_many``, same signature) when the transport supports
+            it, otherwise publishes one by one
+        """
+        if self._needs_token:
+            self._ensure_access_token()
+
+        make, sign = self._envelope_maker(), self._sign_envelope
+        envs = [
+            sign(
+                make(subject=subject, payload=p, labels=labels or list(_DEFAULT_LABELS))
+            )
+            for p in payloads
+        ]
+
+        if self._publish_batch is not None:
+            self._publish_batch(subject, [env.to_dict() for env in envs])
+        else:
+            for env in envs:
+                self._emit_bytes(subject, env)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                {
+                    "event": "emit_many",
+                    "ae_id": self.name,
+                    "subject": subject,
+                    "count": len(envs),
+                }
+            )
+
+    async def aemit(
+        self, subject: str, payload: Dict[str, Any], labels: Optional[List[str]] = None
+    ) -> None:
+        """
+        Awaitable emit() for asyncio-based AE runtimes.
+
+        emit() may block on a token refresh and on the transport's network
+        publish; running it on the client's worker pool keeps the event
+        loop free for the full round-trip.
+        """
+        await asyncio.wrap_future(self._submit(self.emit, subject, payload, labels))
+
+    def emit_nowait(
+        self, subject: str, payload: Dict[str, Any], labels: Optional[List[str]] = None
+    ) -> Future:
+        """
+        Fire-and-forget emit() for callers that must not wait on the publish
+        round-trip (telemetry, audit events).
+
+        The emit runs on the client's worker pool; the returned Future
+        carries its result or exception. Call flush() (or close()) before
+        shutdown to wait for in-flight emits.
+        """
+        fut = self._submit(self.emit, subject, payload, labels, track=True)
+        # Outside the lock: runs the callback inline if already done
+        fut.add_done_callback(self._emit_nowait_done)
+        return fut
+
+    def _emit_nowait_done(self, fut: Future) -> None:
+        with self._pool_lock:
+            self._pending.discard(fut)
+        if not fut.cancelled() and fut.exception() is not None:
+            log.warning("[%s] emit_nowait failed: %s", self.name, fut.exception())
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for in-flight emit_nowait() calls.
+
+        Returns True once all have finished, False if ``timeout`` expired
+        first.
+        """
+        with self._pool_lock:
+            pending = tuple(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def _submit(self, fn: Callable, *args: Any, track: bool = False) -> Future:
+        """
+        Submit to the client's worker pool, building it on first use.
+
+        Serialized with close() under _pool_lock, so a submit never lands
+        on a pool that is being shut down (after close(), a fresh pool is
+        built).
+        """
+        with self._pool_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix=f"ae-{self.name}"
+                )
+            fut = self._executor.submit(fn, *args)
+            if track:
+                self._pending.add(fut)
+            return fut
+
+    def _emit_bytes(self, subject: str, env: "Envelope") -> None:
+        """
+        Hand a signed envelope to the transport.
+
+        When orjson is available and the transport exposes
+        ``publish_bytes(subject, body)``, the envelope is serialized once
+        here and passed as wire bytes; otherwise ``publish`` receives the
+        dict as before.
+        """
+        if self._publish_bytes is not None:
+            body = orjson.dumps(env.to_dict())
+            self._publish_bytes(subject, body)
+        else:
+            self._publish(subject, env.to_dict())
 
     # ------------------------------------------------------------------
     # Listener Registration / Subscriptions
@@ -424,12 +1065,40 @@ class AEClient:
           AEClient ensures transport has the latest access_token via
           _apply_session_to_transport().
         """
-        self._ensure_access_token()
-        for subject, handler in self.registry.handlers.items():
-            self.transport.subscribe(subject, handler)
-        log.info(
-            f"[{self.name}] listening for subscribed subjects: {list(self.registry.handlers.keys())}"
-        )
+        if self._needs_token:
+            self._ensure_access_token()
+        # Frozen (subject, handler) snapshot of what is bound to the transport
+        self._handlers = subs = tuple(self.registry.handlers.items())
+        subscribe = self._subscribe
+        for subject, handler in subs:
+            subscribe(subject, handler)
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                "[%s] listening for subscribed subjects: %s",
+                self.name,
+                [subject for subject, _ in subs],
+            )
+
+    def unregister(self, subject: str) -> Optional[Callable]:
+        """
+        Remove the handler for ``subject`` and release every reference the
+        client holds to it.
+
+        Drops it from the registry and from the snapshot frozen by listen();
+        if it was bound and the transport supports
+        ``unsubscribe(subject)``, the subscription is torn down too.
+        Transports without unsubscribe keep their own reference.
+
+        Returns the removed handler, or None if none was registered.
+        """
+        handler = self.registry.unregister(subject)
+        bound = any(s == subject for s, _ in self._handlers)
+        if bound:
+            self._handlers = tuple((s, h) for s, h in self._handlers if s != subject)
+            unsubscribe = getattr(self.transport, "unsubscribe", None)
+            if unsubscribe is not None:
+                unsubscribe(subject)
+        return handler
 
     # ------------------------------------------------------------------
     # Capabilities
@@ -452,35 +1121,38 @@ class AEClient:
 
         self._ensure_access_token()
 
-        publishes = publishes or []
-        subscribes = subscribes or []
-        meta = meta or {}
-
-        headers = {
-            "Authorization": f"Bearer {self.session.access_token}",
-            "Content-Type": "application/json",
-        }
+        payload = self._capabilities_payload(publishes, subscribes, meta)
+        r = self._http_session().post(self._cap_url, json=payload)
+        return self._read_capabilities_response(r, payload)
 
-        payload = {
-            "publishes": publishes,
-            "subscribes": subscribes,
-            "meta": meta,
+    @staticmethod
+    def _capabilities_payload(
+        publishes: Optional[List[str]],
+        subscribes: Optional[List[str]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "publishes": publishes or [],
+            "subscribes": subscribes or [],
+            "meta": meta or {},
         }
 
-        url = f"{self.abi_url}/ae/capabilities"
-        r = requests.post(url, json=payload, headers=headers)
-        if not r.ok:
+    def _read_capabilities_response(
+        self, r: Any, payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if r.status_code >= 400:
             raise AEClientError(
                 f"Capability declaration failed: {r.status_code} {r.text}"
             )
 
-        resp = r.json()
-        log.info(
-            {
-                "event": "capabilities_declared",
-                "ae_id": self.name,
-                "publishes": publishes,
-                "subscribes": subscribes,
-            }
-        )
+        resp = _json_loads(r.content)
+        if log.isEnabledFor(logging.INFO):
+            log.info(
+                {
+                    "event": "capabilities_declared",
+                    "ae_id": self.name,
+                    "publishes": payload["publishes"],
+                    "subscribes": payload["subscribes"],
+                }
+            )
         return resp
@@ -15,3 +15,7 @@ class EventRegistry:
     def register(self, subject, fn):
         """Direct method version of the decorator-based registration."""
         self.handlers[subject] = fn
+
+    def unregister(self, subject):
+        """Remove and return the handler registered for a subject, if any."""
+        return self.handlers.pop(subject, None)
@@ -1,15 +1,45 @@
 # aegnix_ae/session.py
 import json
 import logging
+import os
 import time
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # optional: stdlib json, compact separators
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
 
 log = logging.getLogger(__name__)
 
 
-@dataclass
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry (e.g. a rename) to disk; no-op on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Required fields of /verify and /session/refresh responses, bound once
+_pluck_verify = itemgetter("session_id", "access_token", "refresh_token")
+_pluck_refresh = itemgetter("access_token", "refresh_token")
+
+
+@dataclass(slots=True)
 class SessionState:
     """
     Client-side view of an ABI session.
@@ -23,6 +53,14 @@ class SessionState:
           "refresh_token": "...",
           "refresh_expires_in": 86400
         }
+
+    ``access_deadline_mono`` is the access-token deadline on the monotonic
+    clock, so a wall clock stepped backwards cannot keep an expired token
+    alive. The monotonic clock stops while the host is suspended, so the
+    wall-clock ``access_expires_at`` is checked too: the access token counts
+    as expired once either deadline has passed. The monotonic deadline is
+    process-local: never persisted, and rebuilt from ``access_expires_at``
+    when a session is loaded.
     """
 
     ae_id: str
@@ -31,16 +69,26 @@ class SessionState:
     access_expires_at: int
     refresh_token: str
     refresh_expires_at: int
+    access_deadline_mono: float = field(default=0.0, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.access_deadline_mono:
+            self.access_deadline_mono = time.monotonic() + (
+                self.access_expires_at - time.time()
+            )
 
     @classmethod
     def from_verify_response(cls, ae_id: str, data: Dict[str, Any]) -> "SessionState":
         now = int(time.time())
+        expires_in = int(data.get("expires_in", 0))
+        session_id, access_token, refresh_token = _pluck_verify(data)
         return cls(
             ae_id=ae_id,
-            session_id=data["session_id"],
-            access_token=data["access_token"],
-            access_expires_at=now + int(data.get("expires_in", 0)),
-            refresh_token=data["refresh_token"],
+            session_id=session_id,
+            access_token=access_token,
+            access_expires_at=now + expires_in,
+            access_deadline_mono=time.monotonic() + expires_in,
+            refresh_token=refresh_token,
             refresh_expires_at=now + int(data.get("refresh_expires_in", 0)),
         )
 
@@ -49,33 +97,59 @@ class SessionState:
         cls, ae_id: str, session_id: str, data: Dict[str, Any]
     ) -> "SessionState":
         now = int(time.time())
+        expires_in = int(data.get("expires_in", 0))
+        access_token, refresh_token = _pluck_refresh(data)
         return cls(
             ae_id=ae_id,
             session_id=session_id,
-            access_token=data["access_token"],
-            access_expires_at=now + int(data.get("expires_in", 0)),
-            refresh_token=data["refresh_token"],
+            access_token=access_token,
+            access_expires_at=now + expires_in,
+            access_deadline_mono=time.monotonic() + expires_in,
+            refresh_token=refresh_token,
             refresh_expires_at=now + int(data.get("refresh_expires_in", 0)),
         )
 
     @classmethod
     def from_dict(cls, raw: Dict[str, Any]) -> "SessionState":
+        raw = dict(raw)
+        raw.pop("access_deadline_mono", None)
         return cls(**raw)
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        raw = asdict(self)
+        del raw["access_deadline_mono"]
+        return raw
 
     # ------------------------------
     # Expiration helpers
     # ------------------------------
-    def is_access_expired(self, leeway: int = 0) -> bool:
-        now = int(time.time())
-        return now >= (self.access_expires_at - leeway)
+    # Callers that check several deadlines pass one ``now`` so the clock is
+    # read once per operation.
+    def is_access_expired(self, leeway: int = 0, now: Optional[int] = None) -> bool:
+        # Expired once either clock passes its deadline (see class docstring)
+        if now is None:
+            now = int(time.time())
+        if now >= (self.access_expires_at - leeway):
+            return True
+        return time.monotonic() >= (self.access_deadline_mono - leeway)
 
-    def is_refresh_expired(self, leeway: int = 0) -> bool:
-        now = int(time.time())
+    def is_refresh_expired(self, leeway: int = 0, now: Optional[int] = None) -> bool:
+        if now is None:
+            now = int(time.time())
         return now >= (self.refresh_expires_at - leeway)
 
+    def check_expired(self, now: int, leeway: int = 0) -> Tuple[bool, bool]:
+        """
+        Return ``(access_expired, refresh_expired)`` as of wall-clock ``now``.
+
+        The access half is the same check emit() acts on, so it also
+        consults the monotonic deadline.
+        """
+        return (
+            self.is_access_expired(leeway=leeway, now=now),
+            self.is_refresh_expired(leeway=leeway, now=now),
+        )
+
 
 class SessionStore:
     """
@@ -84,11 +158,20 @@ class SessionStore:
     Phase 4B: plaintext JSON with path-based isolation.
     Later: add encryption (Fernet) or OS keyring.
 
+    Durability: writes are atomic but not fsync'd by default — the page
+    cache flushes asynchronously, keeping disk flushes off the refresh
+    path. A crash may lose the latest refresh; worst case the AE
+    re-registers on next boot. Pass ``fsync=True`` for long-lived daemons
+    on persistent storage that want every save flushed: the temp file is
+    fsync'd before the rename and the directory after it, so the rename
+    itself survives a crash.
+
     Default path example:
         ~/.aegnix/sessions/<ae_name>.json
     """
 
-    def __init__(self, path: Optional[str] = None):
+    def __init__(self, path: Optional[str] = None, fsync: bool = False):
+        self.fsync = fsync
         if path is None:
             base = Path.home() / ".aegnix" / "sessions"
             base.mkdir(parents=True, exist_ok=True)
@@ -97,29 +180,166 @@ class SessionStore:
             self.path = Path(path)
             self.path.parent.mkdir(parents=True, exist_ok=True)
 
-    def load(self) -> Optional[SessionState]:
+        # Refreshes only rotate tokens; they go to this small sidecar and are
+        # folded into the canonical file on the next full save()
+        self.tokens_path = self.path.with_suffix(self.path.suffix + ".tokens")
+
+        # Parsed result of the last load(), keyed on the files' mtimes
+        self._cache: Optional[SessionState] = None
+        self._cache_key: Optional[Tuple[int, Optional[int]]] = None
+
+        # Last canonical payload written or read; identical saves are
+        # skipped. Seeded lazily by load() or the first save(), so building
+        # a store never touches the disk.
+        self._last_serialized: Optional[bytes] = None
+
+    @staticmethod
+    def _serialize(session: SessionState) -> bytes:
+        return _dumps(session.to_dict())
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+            if self.fsync:
+                _fsync_dir(path.parent)
+        except BaseException:
+            # Never leave a partial temp file next to the session
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+    def _load_canonical(self) -> Optional[SessionState]:
         if not self.path.exists():
             return None
         try:
-            with self.path.open("r", encoding="utf-8") as f:
-                raw = json.load(f)
-            return SessionState.from_dict(raw)
+            data = self.path.read_bytes()
+            session = SessionState.from_dict(_loads(data))
         except Exception as e:
-            log.warning(f"[SessionStore] Failed to load session from {self.path}: {e}")
+            log.warning(
+                "[SessionStore] Failed to load session from %s: %s", self.path, e
+            )
+            return None
+        self._last_serialized = data
+        return session
+
+    def _stat_key(self) -> Optional[Tuple[int, Optional[int]]]:
+        """(canonical mtime, sidecar mtime) in ns, or None if no session file."""
+        try:
+            canonical = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
             return None
+        try:
+            tokens: Optional[int] = self.tokens_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            tokens = None
+        return canonical, tokens
+
+    def load(self) -> Optional[SessionState]:
+        """
+        Load the canonical session, overlaid with the token sidecar when the
+        sidecar belongs to the same session and is at least as recent.
+
+        The parsed session is cached against both files' mtimes, so repeat
+        loads cost two stat() calls until either file changes.
+        """
+        key = self._stat_key()
+        if key is None:
+            self._cache = self._cache_key = None
+            return None
+        if self._cache is not None and key == self._cache_key:
+            return self._cache
+
+        session = self._load_canonical()
+        canonical_mtime, tokens_mtime = key
+        if (
+            session is not None
+            and tokens_mtime is not None
+            and tokens_mtime >= canonical_mtime
+        ):
+            session = self._overlay_tokens(session)
+
+        self._cache, self._cache_key = session, key
+        return session
+
+    def _overlay_tokens(self, session: SessionState) -> SessionState:
+        try:
+            tokens = _loads(self.tokens_path.read_bytes())
+            if tokens.pop("session_id", None) != session.session_id:
+                return session
+            raw = session.to_dict()
+            raw.update(tokens)
+            return SessionState.from_dict(raw)
+        except Exception as e:
+            log.warning(
+                "[SessionStore] Ignoring unreadable token sidecar %s: %s",
+                self.tokens_path,
+                e,
+            )
+            return session
 
     def save(self, session: SessionState) -> None:
+        """
+        Persist the full session as compact JSON.
+
+        The write goes to a temp file that is then renamed over the session
+        file, so a crash mid-write never leaves a truncated session behind.
+        Saves whose payload matches the last one written are skipped. Any
+        token sidecar is folded in and removed.
+        """
+        data = self._serialize(session)
+        self._cache = None
+        try:
+            if self._last_serialized is None and self.path.exists():
+                self._last_serialized = self.path.read_bytes()
+            if data != self._last_serialized:
+                self._write_atomic(self.path, data)
+                self._last_serialized = data
+                log.debug("[SessionStore] Session saved to %s", self.path)
+            if self.tokens_path.exists():
+                self.tokens_path.unlink()
+        except Exception as e:
+            log.error("[SessionStore] Failed to save session: %s", e)
+
+    def save_tokens(self, session: SessionState) -> None:
+        """
+        Persist only the rotating token fields to the sidecar file.
+
+        Used on refresh, where the rest of the session is unchanged; the
+        canonical file is rewritten on the next full save().
+        """
+        data = _dumps(
+            {
+                "session_id": session.session_id,
+                "access_token": session.access_token,
+                "access_expires_at": session.access_expires_at,
+                "refresh_token": session.refresh_token,
+                "refresh_expires_at": session.refresh_expires_at,
+            }
+        )
+        self._cache = None
         try:
-            with self.path.open("w", encoding="utf-8") as f:
-                json.dump(session.to_dict(), f)
-            log.debug(f"[SessionStore] Session saved to {self.path}")
+            self._write_atomic(self.tokens_path, data)
+            log.debug("[SessionStore] Session tokens saved to %s", self.tokens_path)
         except Exception as e:
-            log.error(f"[SessionStore] Failed to save session: {e}")
+            log.error("[SessionStore] Failed to save session tokens: %s", e)
 
     def clear(self) -> None:
         try:
+            self._cache = None
+            self._last_serialized = None
+            if self.tokens_path.exists():
+                self.tokens_path.unlink()
             if self.path.exists():
                 self.path.unlink()
-                log.debug(f"[SessionStore] Session cleared at {self.path}")
+                log.debug("[SessionStore] Session cleared at %s", self.path)
         except Exception as e:
-            log.error(f"[SessionStore] Failed to clear session: {e}")
+            log.error("[SessionStore] Failed to clear session: %s", e)
@@ -0,0 +1,53 @@
+# aegnix_ae/signing.py
+import logging
+from functools import partial
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+class Ed25519Signer:
+    """
+    Detached Ed25519 signer bound to one 32-byte private key seed.
+
+    The backend is resolved once, in order of preference:
+
+        1. PyNaCl      (libsodium)
+        2. cryptography (OpenSSL)
+        3. aegnix_core.crypto.ed25519_sign (always available)
+
+    Native key objects keep the expanded secret scalar, so the seed is
+    hashed once here instead of on every signature. Signatures are
+    identical across backends (RFC 8032), so callers never need to know
+    which one is in use.
+    """
+
+    __slots__ = ("backend", "sign")
+
+    def __init__(self, priv_raw: bytes):
+        self.backend, self.sign = _resolve_backend(priv_raw)
+        log.debug("[Ed25519Signer] using %s backend", self.backend)
+
+
+def _resolve_backend(priv_raw: bytes) -> "tuple[str, Callable[[bytes], bytes]]":
+    # priv_raw is the 32-byte seed; AEClient rejects any other shape
+    try:
+        from nacl.signing import SigningKey
+    except ImportError:
+        pass
+    else:
+        key = SigningKey(priv_raw)
+        return "pynacl", lambda msg: key.sign(msg).signature
+
+    try:
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import (
+            Ed25519PrivateKey,
+        )
+    except ImportError:
+        pass
+    else:
+        return "cryptography", Ed25519PrivateKey.from_private_bytes(priv_raw).sign
+
+    from aegnix_core.crypto import ed25519_sign
+
+    return "aegnix_core", partial(ed25519_sign, priv_raw)
@@ -0,0 +1,576 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("aegnix_core")
+
+from aegnix_ae import client_v2  # noqa: E402
+from aegnix_ae.client_v2 import AEClient, RegistrationError, SessionError  # noqa: E402
+from aegnix_ae.session import SessionState  # noqa: E402
+
+
+class FakeTransport:
+    def __init__(self):
+        self.subscriptions = {}
+        self.published = []
+        self.unsubscribed = []
+        self.flushes = 0
+
+    def publish(self, subject, message):
+        self.published.append((subject, message))
+
+    def subscribe(self, subject, handler):
+        self.subscriptions[subject] = handler
+
+    def unsubscribe(self, subject):
+        self.unsubscribed.append(subject)
+        self.subscriptions.pop(subject, None)
+
+    def flush(self):
+        self.flushes += 1
+
+
+class BatchTransport(FakeTransport):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def publish_batch(self, subject, messages):
+        self.batches.append((subject, messages))
+
+
+class ManyTransport(FakeTransport):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def publish_many(self, subject, messages):
+        self.batches.append((subject, messages))
+
+
+class TokenTransport(FakeTransport):
+    def __init__(self):
+        super().__init__()
+        self.tokens = []
+
+    def set_token(self, token):
+        self.tokens.append(token)
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"{}"):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode()
+
+
+class FakeHTTP:
+    def __init__(self, response):
+        self.response = response
+        self.headers = {}
+        self.calls = []
+
+    def post(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.response
+
+    def close(self):
+        pass
+
+
+def make_session(expires_in=300, refresh_expires_in=86400):
+    return SessionState.from_verify_response(
+        "test-ae",
+        {
+            "session_id": "sess-1",
+            "access_token": "access-1",
+            "refresh_token": "refresh-1",
+            "expires_in": expires_in,
+            "refresh_expires_in": refresh_expires_in,
+        },
+    )
+
+
+def make_client(tmp_path, transport=None, **kwargs):
+    kwargs.setdefault("session_store_path", str(tmp_path / "session.json"))
+    return AEClient(
+        "test-ae",
+        abi_url="http://abi.invalid",
+        keypair={"priv": os.urandom(32)},
+        transport=transport if transport is not None else FakeTransport(),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def transport():
+    return FakeTransport()
+
+
+@pytest.fixture
+def client(tmp_path, transport):
+    ae = make_client(tmp_path, transport)
+    yield ae
+    ae.close()
+
+
+@pytest.fixture
+def fast_refresh(monkeypatch):
+    monkeypatch.setattr(client_v2, "_REFRESH_MIN_S", 0.01)
+    monkeypatch.setattr(client_v2, "_REFRESH_RETRY_S", 0.01)
+    monkeypatch.setattr(client_v2, "_REFRESH_RETRY_MAX_S", 0.04)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+# ------------------------------
+# Handlers
+# ------------------------------
+def test_unregister_releases_handler_everywhere(client, transport):
+    @client.on("fusion.a")
+    def handle_a(msg):
+        pass
+
+    @client.on("fusion.b")
+    def handle_b(msg):
+        pass
+
+    client.listen()
+    assert client.unregister("fusion.a") is handle_a
+
+    assert "fusion.a" not in client.registry.handlers
+    assert all(subject != "fusion.a" for subject, _ in client._handlers)
+    assert transport.unsubscribed == ["fusion.a"]
+    assert transport.subscriptions == {"fusion.b": handle_b}
+
+
+def test_unregister_unknown_subject(client, transport):
+    assert client.unregister("fusion.none") is None
+    assert transport.unsubscribed == []
+
+
+# ------------------------------
+# Registration
+# ------------------------------
+def test_async_register_finishes_every_ae_before_raising(tmp_path, monkeypatch):
+    pytest.importorskip("httpx")
+    finished = []
+
+    async def register_single(self, http):
+        if self.name == "bad":
+            raise RegistrationError("rejected")
+        await asyncio.sleep(0.01)
+        assert not http.is_closed
+        finished.append(self.name)
+        return True
+
+    monkeypatch.setattr(AEClient, "_async_register_single", register_single)
+    clients = [
+        make_client(tmp_path, session_store_path=str(tmp_path / "a.json")),
+        make_client(tmp_path, session_store_path=str(tmp_path / "b.json")),
+    ]
+    clients[0].name = "bad"
+
+    with pytest.raises(RegistrationError):
+        asyncio.run(AEClient.async_register(clients))
+    assert finished == ["test-ae"]
+
+
+# ------------------------------
+# Refresh
+# ------------------------------
+def test_refresh_thread_renews_before_expiry(client, monkeypatch, fast_refresh):
+    calls = []
+
+    def renew(self):
+        calls.append(1)
+        self.session = make_session(expires_in=3600)
+
+    monkeypatch.setattr(AEClient, "refresh_session", renew)
+    client.session = make_session(expires_in=0)
+    client._start_refresh_thread()
+
+    assert wait_for(lambda: len(calls) == 1)
+    time.sleep(0.05)
+    assert len(calls) == 1  # next refresh is scheduled ahead of expiry
+
+
+def test_refresh_post_is_bounded_and_reports_status(client):
+    client.session = make_session()
+    http = client._http = FakeHTTP(FakeResponse(401, b"revoked"))
+
+    with pytest.raises(SessionError) as exc:
+        client.refresh_session()
+
+    assert exc.value.status_code == 401
+    _, kwargs = http.calls[0]
+    assert kwargs["timeout"] == client_v2._REFRESH_TIMEOUT_S
+
+
+def test_refresh_loop_stops_on_rejection(client, monkeypatch, fast_refresh):
+    calls = []
+
+    def rejected(self):
+        calls.append(1)
+        raise SessionError("revoked", status_code=401)
+
+    monkeypatch.setattr(AEClient, "refresh_session", rejected)
+    client.session = make_session(expires_in=0)
+    client._start_refresh_thread()
+
+    assert wait_for(lambda: not client._refresh_thread.is_alive())
+    assert len(calls) == 1
+
+
+class RecordingStop:
+    """Stand-in for the refresher's stop Event: records waits, never blocks."""
+
+    def __init__(self, max_waits):
+        self.waits = []
+        self.max_waits = max_waits
+
+    def is_set(self):
+        return len(self.waits) >= self.max_waits
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        return False
+
+    def set(self):
+        pass
+
+
+def test_refresh_loop_backs_off_on_transient_failure(client, monkeypatch):
+    def unavailable(self):
+        raise SessionError("bad gateway", status_code=503)
+
+    monkeypatch.setattr(AEClient, "refresh_session", unavailable)
+    client.session = make_session(expires_in=0)
+    client._refresh_stop = stop = RecordingStop(max_waits=9)
+
+    client._refresh_loop()
+
+    # first wait is the scheduled refresh (minimum interval), then backoff
+    assert stop.waits == [
+        client_v2._REFRESH_MIN_S,
+        5,
+        10,
+        20,
+        40,
+        80,
+        160,
+        300,
+        300,
+    ]
+
+
+def test_refresh_loop_recovers_after_transient_failure(
+    client, monkeypatch, fast_refresh
+):
+    calls = []
+
+    def flaky(self):
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("reset")
+        self.session = make_session(expires_in=3600)
+
+    monkeypatch.setattr(AEClient, "refresh_session", flaky)
+    client.session = make_session(expires_in=0)
+    client._start_refresh_thread()
+
+    assert wait_for(lambda: len(calls) == 2)
+    time.sleep(0.05)
+    assert len(calls) == 2  # next refresh is scheduled ahead of expiry
+    assert client._refresh_thread.is_alive()
+
+
+@pytest.fixture
+def fast_switching():
+    # Switch threads as often as possible so races surface quickly
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_emit_racing_close_with_refresher(tmp_path, monkeypatch, fast_switching):
+    # close() drops _refresh_thread while emit_nowait() workers are still
+    # checking the token
+    monkeypatch.setattr(AEClient, "refresh_session", lambda self: None)
+    transport = TokenTransport()
+    ae = make_client(tmp_path, transport)
+    ae.session = make_session(expires_in=3600)
+
+    futures = []
+    for _ in range(100):
+        ae._start_refresh_thread()
+        futures += [ae.emit_nowait("fusion.a", {"i": i}) for i in range(20)]
+        ae.close()
+
+    assert [f.exception() for f in futures if f.exception()] == []
+    assert len(transport.published) == 2000
+
+
+def test_refresh_loop_enforces_minimum_interval(client, monkeypatch):
+    monkeypatch.setattr(client_v2, "_REFRESH_MIN_S", 0.2)
+    calls = []
+
+    def zero_lifetime(self):
+        calls.append(1)
+        self.session = make_session(expires_in=0)
+
+    monkeypatch.setattr(AEClient, "refresh_session", zero_lifetime)
+    client.session = make_session(expires_in=0)
+    client._start_refresh_thread()
+
+    time.sleep(0.5)
+    client._stop_refresh_thread()
+    assert 1 <= len(calls) <= 3
+
+
+# ------------------------------
+# Emit
+# ------------------------------
+def test_emit_without_session_on_tokenless_transport(client, transport):
+    client.emit("fusion.a", {"i": 1})
+
+    assert client.session is None
+    assert len(transport.published) == 1
+
+
+def test_emit_signs_with_positional_key_material(client, monkeypatch):
+    calls = []
+
+    def positional_only(env, priv, key_id, /):
+        calls.append((priv, key_id))
+        return env
+
+    monkeypatch.setattr(client_v2, "sign_envelope", positional_only)
+    client.emit("fusion.a", {})
+
+    assert calls == [(client._priv_raw, client._key_id)]
+
+
+def test_default_labels_are_not_shared(client, transport):
+    client.emit("fusion.a", {})
+    client.emit_many("fusion.a", [{}, {}])
+    first, *rest = [message for _, message in transport.published]
+
+    first["labels"].append("mutated")
+
+    assert [message["labels"] for message in rest] == [["default"], ["default"]]
+    assert client_v2._DEFAULT_LABELS == ("default",)
+
+
+def test_emit_many_falls_back_to_publish(client, transport):
+    client.emit_many("fusion.a", [{"i": 1}, {"i": 2}])
+
+    assert [subject for subject, _ in transport.published] == ["fusion.a"] * 2
+
+
+@pytest.mark.parametrize("transport_cls", [BatchTransport, ManyTransport])
+def test_emit_many_uses_batch_publish(tmp_path, transport_cls):
+    transport = transport_cls()
+    ae = make_client(tmp_path, transport)
+
+    ae.emit_many("fusion.a", [{"i": 1}, {"i": 2}, {"i": 3}])
+    ae.close()
+
+    assert transport.published == []
+    assert len(transport.batches) == 1
+    subject, messages = transport.batches[0]
+    assert subject == "fusion.a"
+    assert len(messages) == 3
+
+
+def test_emit_nowait_and_flush(client, transport):
+    release = threading.Event()
+    original_publish = transport.publish
+
+    def slow_publish(subject, message):
+        release.wait(2)
+        original_publish(subject, message)
+
+    client._publish = slow_publish
+
+    futures = [client.emit_nowait("fusion.a", {"i": i}) for i in range(3)]
+    assert client.flush(timeout=0.01) is False
+
+    release.set()
+    assert client.flush(timeout=2) is True
+    assert all(f.done() and f.exception() is None for f in futures)
+    assert len(transport.published) == 3
+    assert not client._pending
+
+
+def test_emit_nowait_surfaces_failures(client, transport):
+    def failing_publish(subject, message):
+        raise RuntimeError("boom")
+
+    client._publish = failing_publish
+
+    future = client.emit_nowait("fusion.a", {})
+    assert client.flush(timeout=2) is True
+    assert isinstance(future.exception(), RuntimeError)
+
+
+def test_emit_nowait_racing_close(client, transport):
+    errors = []
+
+    def emitter():
+        for i in range(100):
+            try:
+                client.emit_nowait("fusion.a", {"i": i})
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=emitter) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for _ in range(5):
+        client.close()
+    for t in threads:
+        t.join()
+
+    assert client.flush(timeout=5) is True
+    assert errors == []
+    assert len(transport.published) == 400
+
+
+# ------------------------------
+# Transports / lifecycle
+# ------------------------------
+@pytest.fixture
+def factory(monkeypatch):
+    built = []
+
+    def transport_factory(kind=None, abi_url=None):
+        transport = FakeTransport()
+        built.append(transport)
+        return transport
+
+    monkeypatch.setattr(client_v2, "_transport_factory", transport_factory)
+    monkeypatch.setattr(client_v2, "_transport_cache", {})
+    return built
+
+
+def test_factory_without_config_uses_env(tmp_path, monkeypatch):
+    seen = []
+
+    def transport_factory():
+        seen.append(os.environ.get("AE_TRANSPORT"))
+        return FakeTransport()
+
+    monkeypatch.setattr(client_v2, "_transport_factory", transport_factory)
+    monkeypatch.delenv("AE_TRANSPORT", raising=False)
+
+    ae = make_client(tmp_path, "local")
+
+    assert seen == ["local"]
+    assert isinstance(ae.transport, FakeTransport)
+
+
+def test_factory_gets_kind_and_abi_url(tmp_path, monkeypatch):
+    seen = []
+
+    def transport_factory(kind=None, abi_url=None):
+        seen.append((kind, abi_url))
+        return FakeTransport()
+
+    monkeypatch.setattr(client_v2, "_transport_factory", transport_factory)
+
+    make_client(tmp_path, "http")
+
+    assert seen == [("http", "http://abi.invalid")]
+
+
+def test_transports_are_private_by_default(tmp_path, factory):
+    a = make_client(tmp_path, "local", session_store_path=str(tmp_path / "a.json"))
+    b = make_client(tmp_path, "local", session_store_path=str(tmp_path / "b.json"))
+
+    assert a.transport is not b.transport
+    assert client_v2._transport_cache == {}
+
+
+def test_shared_transport_is_refcounted(tmp_path, factory):
+    a = make_client(
+        tmp_path,
+        "local",
+        share_transport=True,
+        session_store_path=str(tmp_path / "a.json"),
+    )
+    b = make_client(
+        tmp_path,
+        "local",
+        share_transport=True,
+        session_store_path=str(tmp_path / "b.json"),
+    )
+    shared = a.transport
+    assert b.transport is shared
+    assert len(factory) == 1
+
+    a.close()
+    assert shared.flushes == 0
+    assert len(client_v2._transport_cache) == 1
+
+    b.close()
+    assert shared.flushes == 1
+    assert client_v2._transport_cache == {}
+
+
+def test_session_fsync_reaches_the_store(tmp_path):
+    assert make_client(tmp_path).session_store.fsync is False
+    assert make_client(tmp_path, session_fsync=True).session_store.fsync is True
+
+
+def test_token_transports_are_never_shared(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(client_v2, "_transport_factory", lambda **kw: TokenTransport())
+    monkeypatch.setattr(client_v2, "_transport_cache", {})
+    caplog.set_level("DEBUG", logger=client_v2.__name__)
+
+    a = make_client(tmp_path, "http", share_transport=True)
+    b = make_client(tmp_path, "http", share_transport=True)
+
+    assert a.transport is not b.transport
+    assert client_v2._transport_cache == {}
+    assert "Not sharing http transport" in caplog.text
+
+
+def test_close_folds_token_sidecar(client):
+    store = client.session_store
+    client.session = make_session()
+    store.save(client.session)
+    client.session = SessionState.from_refresh_response(
+        "test-ae",
+        "sess-1",
+        {"access_token": "access-2", "refresh_token": "refresh-2", "expires_in": 300},
+    )
+    store.save_tokens(client.session)
+
+    client.close()
+
+    assert not store.tokens_path.exists()
+    assert store.load().access_token == "access-2"
+
+
+def test_close_leaves_cleared_session_cleared(client):
+    store = client.session_store
+    client.session = make_session()
+    store.save(client.session)
+    store.clear()
+
+    client.close()
+
+    assert not store.path.exists()
@@ -0,0 +1,277 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from aegnix_ae.session import SessionState, SessionStore
+
+
+def make_session(access_token="access-1", refresh_token="refresh-1", **overrides):
+    data = {
+        "session_id": "sess-1",
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "expires_in": 300,
+        "refresh_expires_in": 86400,
+    }
+    data.update(overrides)
+    return SessionState.from_verify_response("test-ae", data)
+
+
+def rotated(session, access_token="access-2", refresh_token="refresh-2"):
+    return SessionState.from_refresh_response(
+        "test-ae",
+        session.session_id,
+        {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": 300,
+            "refresh_expires_in": 86400,
+        },
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SessionStore(str(tmp_path / "session.json"))
+
+
+def record_writes(monkeypatch):
+    writes = []
+    replace = os.replace
+
+    def recording_replace(src, dst):
+        writes.append(dst)
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", recording_replace)
+    return writes
+
+
+def bump_mtime(path, seconds=1):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+# ------------------------------
+# SessionState
+# ------------------------------
+def test_state_round_trip_drops_monotonic_deadline():
+    session = make_session()
+    raw = session.to_dict()
+
+    assert "access_deadline_mono" not in raw
+    assert SessionState.from_dict(raw) == session
+
+
+def test_state_rebuilds_monotonic_deadline_from_wall_clock():
+    raw = make_session().to_dict()
+    raw["access_expires_at"] = int(time.time()) + 100
+
+    restored = SessionState.from_dict(raw)
+
+    remaining = restored.access_deadline_mono - time.monotonic()
+    assert 95 < remaining <= 100
+
+
+def test_access_expired_once_either_clock_passes_deadline():
+    assert make_session().is_access_expired() is False
+
+    suspended = make_session()
+    suspended.access_expires_at = 0  # monotonic clock stood still
+    assert suspended.is_access_expired() is True
+
+    stepped_back = make_session()
+    stepped_back.access_deadline_mono = time.monotonic() - 1  # wall clock behind
+    assert stepped_back.is_access_expired() is True
+
+
+def test_check_expired_uses_now_for_both_tokens():
+    session = make_session()
+    now = session.access_expires_at
+
+    assert session.check_expired(now - 10) == (False, False)
+    assert session.check_expired(now) == (True, False)
+    assert session.check_expired(session.refresh_expires_at) == (True, True)
+
+
+# ------------------------------
+# SessionStore
+# ------------------------------
+def test_load_missing_returns_none(store):
+    assert store.load() is None
+
+
+def test_save_load_round_trip(store):
+    session = make_session()
+    store.save(session)
+
+    assert store.load() == session
+
+
+def test_session_file_is_plain_json(store):
+    session = make_session()
+    store.save(session)
+
+    assert json.loads(store.path.read_bytes()) == session.to_dict()
+
+
+def test_save_is_atomic_and_private(store):
+    store.save(make_session())
+
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o600
+    assert not store.path.with_suffix(".json.tmp").exists()
+
+
+def test_fsync_flushes_file_and_directory(tmp_path, monkeypatch):
+    store = SessionStore(str(tmp_path / "session.json"), fsync=True)
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.append(stat.S_ISDIR(os.fstat(fd).st_mode))
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    store.save(make_session())
+
+    assert synced == [False, True]
+
+
+def test_failed_write_leaves_no_temp_file(store, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    store.save(make_session())
+
+    assert list(store.path.parent.iterdir()) == []
+
+
+def test_identical_save_is_skipped(store, monkeypatch):
+    session = make_session()
+    store.save(session)
+
+    writes = record_writes(monkeypatch)
+    store.save(session)
+    assert writes == []
+
+    store.save(rotated(session))
+    assert len(writes) == 1
+
+
+def test_identical_save_skipped_across_instances(store, monkeypatch):
+    session = make_session()
+    store.save(session)
+
+    reopened = SessionStore(str(store.path))
+    writes = record_writes(monkeypatch)
+    reopened.save(session)
+
+    assert writes == []
+
+
+def test_corrupt_session_is_read_once(store, caplog):
+    store.path.write_bytes(b"{not json")
+
+    reopened = SessionStore(str(store.path))
+    assert reopened.load() is None
+
+    failures = [r for r in caplog.records if "Failed to load" in r.getMessage()]
+    assert len(failures) == 1
+
+
+def test_save_tokens_overlays_canonical_session(store):
+    session = make_session()
+    store.save(session)
+    refreshed = rotated(session)
+
+    store.save_tokens(refreshed)
+    loaded = store.load()
+
+    assert store.tokens_path.exists()
+    assert loaded.access_token == "access-2"
+    assert loaded.refresh_token == "refresh-2"
+    assert loaded.session_id == session.session_id
+
+
+def test_sidecar_for_other_session_is_ignored(store):
+    session = make_session()
+    store.save(session)
+    other = make_session(session_id="sess-2", access_token="other")
+
+    store.save_tokens(other)
+
+    assert store.load().access_token == "access-1"
+
+
+def test_stale_sidecar_is_ignored(store):
+    session = make_session()
+    store.save(session)
+    store.save_tokens(rotated(session))
+    bump_mtime(store.path)
+
+    assert store.load().access_token == "access-1"
+
+
+def test_unreadable_sidecar_falls_back_to_canonical(store):
+    store.save(make_session())
+    store.tokens_path.write_bytes(b"{not json")
+    bump_mtime(store.tokens_path)
+
+    assert store.load().access_token == "access-1"
+
+
+def test_full_save_folds_and_removes_sidecar(store):
+    session = make_session()
+    store.save(session)
+    refreshed = rotated(session)
+    store.save_tokens(refreshed)
+
+    store.save(refreshed)
+
+    assert not store.tokens_path.exists()
+    assert SessionStore(str(store.path)).load() == refreshed
+
+
+def test_load_is_cached_until_files_change(store):
+    session = make_session()
+    store.save(session)
+
+    first = store.load()
+    assert store.load() is first
+
+    store.save_tokens(rotated(session))
+    second = store.load()
+    assert second is not first
+    assert second.access_token == "access-2"
+
+
+def test_load_cache_sees_external_writes(store):
+    store.save(make_session())
+    assert store.load().access_token == "access-1"
+
+    other = SessionStore(str(store.path))
+    other.save(make_session(access_token="external"))
+    bump_mtime(store.path)
+
+    assert store.load().access_token == "external"
+
+
+def test_clear_removes_session_and_sidecar(store):
+    session = make_session()
+    store.save(session)
+    store.save_tokens(rotated(session))
+    store.load()
+
+    store.clear()
+
+    assert not store.path.exists()
+    assert not store.tokens_path.exists()
+    assert store.load() is None
+
+    # after clear, the same session is written again rather than skipped
+    store.save(session)
+    assert store.load() == session
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+from aegnix_ae.signing import Ed25519Signer
+
+SEED = bytes(range(32))
+MESSAGE = b"challenge-nonce"
+
+
+def hide_modules(monkeypatch, *names):
+    for name in names:
+        monkeypatch.setitem(sys.modules, name, None)
+
+
+def test_prefers_pynacl():
+    nacl_signing = pytest.importorskip("nacl.signing")
+
+    signer = Ed25519Signer(SEED)
+
+    assert signer.backend == "pynacl"
+    verify_key = nacl_signing.SigningKey(SEED).verify_key
+    verify_key.verify(MESSAGE, signer.sign(MESSAGE))
+
+
+def test_falls_back_to_cryptography(monkeypatch):
+    ed25519 = pytest.importorskip("cryptography.hazmat.primitives.asymmetric.ed25519")
+    hide_modules(monkeypatch, "nacl", "nacl.signing")
+
+    signer = Ed25519Signer(SEED)
+
+    assert signer.backend == "cryptography"
+    public_key = ed25519.Ed25519PrivateKey.from_private_bytes(SEED).public_key()
+    public_key.verify(signer.sign(MESSAGE), MESSAGE)
+
+
+def test_falls_back_to_aegnix_core(monkeypatch):
+    crypto = pytest.importorskip("aegnix_core.crypto")
+    hide_modules(
+        monkeypatch,
+        "nacl",
+        "nacl.signing",
+        "cryptography",
+        "cryptography.hazmat.primitives.asymmetric.ed25519",
+    )
+
+    signer = Ed25519Signer(SEED)
+
+    assert signer.backend == "aegnix_core"
+    assert signer.sign(MESSAGE) == crypto.ed25519_sign(SEED, MESSAGE)
+
+
+def test_native_backends_agree():
+    pytest.importorskip("nacl.signing")
+    pytest.importorskip("cryptography")
+    seed = os.urandom(32)
+
+    nacl_sig = Ed25519Signer(seed).sign(MESSAGE)
+    with pytest.MonkeyPatch.context() as mp:
+        hide_modules(mp, "nacl", "nacl.signing")
+        crypto_sig = Ed25519Signer(seed).sign(MESSAGE)
+
+    assert nacl_sig == crypto_sig